@@ -2,10 +2,14 @@
 # Financial Insights Dashboard - Grid Layout Version
 # =====================================================
 
+from pathlib import Path
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import sequential
 
 # -----------------------------------------------------
 # App Configuration
@@ -17,145 +21,17 @@ st.set_page_config(
 )
 
 # Custom CSS for modern styling with card layout
-st.markdown("""
-    <style>
-    /* Import modern font */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global styling */
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Main title styling */
-    h1 {
-        font-weight: 700;
-        font-size: 2.5rem !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    /* Subtitle styling */
-    .subtitle {
-        font-size: 1.1rem;
-        color: #64748b;
-        font-weight: 400;
-        margin-bottom: 2rem;
-    }
-    
-    /* Card styling */
-    .insight-card {
-        background: white;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-        border: 1px solid #f1f5f9;
-        margin-bottom: 1.5rem;
-        transition: all 0.3s ease;
-    }
-    
-    .insight-card:hover {
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.15);
-        border-color: #e0e7ff;
-    }
-    
-    .card-title {
-        font-size: 1.2rem;
-        font-weight: 600;
-        color: #1e293b;
-        margin-bottom: 0.5rem;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    .card-subtitle {
-        font-size: 0.9rem;
-        color: #64748b;
-        margin-bottom: 1rem;
-    }
-    
-    /* Section headers */
-    h2, h3 {
-        font-weight: 600;
-        color: #1e293b;
-        margin-top: 1.5rem !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #faf5ff 0%, #f3e8ff 100%);
-        border-right: 1px solid #e9d5ff;
-    }
-    
-    [data-testid="stSidebar"] > div:first-child {
-        padding-top: 2rem;
-    }
-    
-    [data-testid="stSidebar"] h3 {
-        color: #6b21a8;
-        font-weight: 600;
-        font-size: 1.3rem;
-        letter-spacing: -0.02em;
-        margin-bottom: 1.5rem !important;
-    }
-    
-    [data-testid="stSidebar"] .stMultiSelect label,
-    [data-testid="stSidebar"] .stSelectbox label {
-        color: #7c3aed;
-        font-weight: 500;
-        font-size: 0.9rem;
-    }
-    
-    [data-testid="stSidebar"] hr {
-        margin: 2rem 0;
-        border: none;
-        height: 1px;
-        background: linear-gradient(90deg, transparent, #ddd6fe, transparent);
-    }
-    
-    /* Info boxes */
-    .stAlert {
-        background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
-        border-left: 4px solid #667eea;
-        border-radius: 8px;
-        padding: 1rem 1.5rem;
-    }
-    
-    /* Metric cards */
-    [data-testid="stMetricValue"] {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #1e293b;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-size: 0.9rem;
-        color: #64748b;
-    }
-    
-    /* Chart containers */
-    .js-plotly-plot {
-        border-radius: 12px;
-    }
-    
-    /* Remove default spacing */
-    .block-container {
-        padding-top: 3rem;
-        padding-bottom: 3rem;
-    }
-    
-    /* Warning boxes */
-    .stWarning {
-        background: #fef3c7;
-        border-left: 4px solid #f59e0b;
-        border-radius: 8px;
-    }
-    </style>
-""", unsafe_allow_html=True)
+FONT_LINKS = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap">'
+)
+
+@st.cache_resource
+def _css():
+    return FONT_LINKS + "<style>" + Path("styles.css").read_text() + "</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
 
 # -----------------------------------------------------
 # Header Section
@@ -166,10 +42,20 @@ st.markdown('<p class="subtitle">Interactive analytics to drive strategic busine
 # -----------------------------------------------------
 # Load Dataset
 # -----------------------------------------------------
-@st.cache_data
+# cache_resource hands every session the same frame instead of unpickling a
+# fresh copy per rerun; the frame is treated as read-only throughout the app
+@st.cache_resource
 def load_data():
-    df = pd.read_excel("Financial Data - DA Assesment.xlsx")
+    # financial.parquet is generated from the Excel workbook by to_parquet.py
+    df = pd.read_parquet("financial.parquet", engine="pyarrow")
     df.columns = df.columns.str.strip()
+    df = df.astype({
+        "Year": "Int16",
+        "Sales": "float32",
+        "Profit": "float32",
+    })
+    for col in ("Country", "Segment", "Product", "Discount Band", "Month Name"):
+        df[col] = df[col].astype("category")
     return df
 
 df = load_data()
@@ -180,9 +66,17 @@ df = load_data()
 st.sidebar.markdown("### 🔎 Filter Controls")
 st.sidebar.markdown("---")
 
-year_options = sorted(df["Year"].dropna().unique())
-country_options = sorted(df["Country"].dropna().unique())
-segment_options = sorted(df["Segment"].dropna().unique())
+@st.cache_data
+def option_lists():
+    return {
+        col: sorted(df[col].dropna().unique().tolist())
+        for col in ("Year", "Country", "Segment")
+    }
+
+options = option_lists()
+year_options = options["Year"]
+country_options = options["Country"]
+segment_options = options["Segment"]
 
 year_filter = st.sidebar.multiselect(
     "📅 Year",
@@ -205,12 +99,97 @@ segment_filter = st.sidebar.multiselect(
 st.sidebar.markdown("---")
 st.sidebar.markdown("*Adjust filters to customize your analysis*")
 
-# Apply filters
-filtered_df = df[
-    (df["Year"].isin(year_filter)) &
-    (df["Country"].isin(country_filter)) &
-    (df["Segment"].isin(segment_filter))
-]
+# -----------------------------------------------------
+# Pre-aggregated Views
+# -----------------------------------------------------
+def column_codes(col):
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy(), col.cat.categories
+    codes, uniques = pd.factorize(col, sort=True)
+    return codes, pd.Index(uniques)
+
+FILTER_COLUMNS = ("Year", "Country", "Segment")
+
+@st.cache_resource
+def filter_codes():
+    return [column_codes(df[col]) for col in FILTER_COLUMNS]
+
+def filter_mask(*selections):
+    """Row mask for the sidebar filters, via one lookup over the code triples."""
+    columns = filter_codes()
+    # One extra trailing slot per axis catches the -1 code of missing values
+    # and is never set, so rows with a missing key are always excluded
+    allowed = np.zeros(tuple(len(levels) + 1 for _, levels in columns), dtype=bool)
+    picked = []
+    for (_, levels), selected in zip(columns, selections):
+        positions = levels.get_indexer(list(selected))
+        picked.append(positions[positions >= 0])
+    allowed[np.ix_(*picked)] = True
+    return allowed[tuple(codes for codes, _ in columns)]
+
+def grouped_reduce(frame, keys, values, mean=False):
+    """Sum (or average) ``values`` over the observed combinations of ``keys``."""
+    codes, levels = zip(*(column_codes(frame[k]) for k in keys))
+    shape = tuple(len(level) for level in levels)
+    codes = np.vstack(codes)
+    valid = (codes >= 0).all(axis=0)
+
+    # Pack the per-key codes into a single group id and reduce with bincount
+    group_ids = np.ravel_multi_index(codes[:, valid], shape)
+    n_groups = int(np.prod(shape))
+    counts = np.bincount(group_ids, minlength=n_groups)
+    observed = np.flatnonzero(counts)
+
+    positions = np.unravel_index(observed, shape)
+    index = pd.MultiIndex.from_arrays(
+        [level.take(pos) for level, pos in zip(levels, positions)],
+        names=keys
+    )
+    if len(keys) == 1:
+        index = index.get_level_values(0)
+
+    def reduce(value):
+        raw = frame[value].to_numpy(dtype=np.float64)[valid]
+        present = ~np.isnan(raw)
+        sums = np.bincount(group_ids, weights=np.where(present, raw, 0.0), minlength=n_groups)[observed]
+        if not mean:
+            return sums
+        # Like groupby().mean(), NaN values count towards neither the sum nor
+        # the divisor; groups with no values at all come out as NaN
+        n_values = np.bincount(group_ids, weights=present, minlength=n_groups)[observed]
+        with np.errstate(invalid="ignore"):
+            return sums / n_values
+
+    if isinstance(values, str):
+        return pd.Series(reduce(values), index=index, name=values)
+    return pd.DataFrame({value: reduce(value) for value in values}, index=index)
+
+# Only the columns the dashboard groups on or sums are carried past the filter
+AGG_COLUMNS = ["Year", "Country", "Segment", "Product", "Discount Band", "Month Name", "Sales", "Profit"]
+
+@st.cache_data
+def aggregates(year_t, country_t, segment_t):
+    mask = filter_mask(year_t, country_t, segment_t)
+    filtered_df = df.iloc[mask.nonzero()[0], df.columns.get_indexer(AGG_COLUMNS)]
+    return {
+        "sales_yp": grouped_reduce(filtered_df, ["Product", "Year"], "Sales").unstack(),
+        "profit_sc": grouped_reduce(filtered_df, ["Segment", "Country"], "Profit"),
+        "sales_cp": grouped_reduce(filtered_df, ["Country", "Product"], "Sales"),
+        "sales_p": grouped_reduce(filtered_df, ["Product"], "Sales"),
+        "discount_mean": grouped_reduce(filtered_df, ["Discount Band"], ["Sales", "Profit"], mean=True),
+        "monthly_pm": grouped_reduce(filtered_df, ["Product", "Month Name"], "Sales"),
+        "country_sp": grouped_reduce(filtered_df, ["Country"], ["Sales", "Profit"]),
+    }
+
+# Filters are passed as sorted tuples so they hash as a stable cache key;
+# per-row selectors (product, top N, country) only slice these frames.
+# Aggregates follow the (sorted) category order, so the indexes below
+# double as selector options without another sort.
+aggs = aggregates(
+    tuple(sorted(year_filter)),
+    tuple(sorted(country_filter)),
+    tuple(sorted(segment_filter))
+)
 
 # Color scheme for charts
 color_scheme = {
@@ -222,60 +201,128 @@ color_scheme = {
     'info': '#3b82f6'
 }
 
+# Shared chart layout, layered on top of the active default template
+# (Streamlit's own theme template). Streamlit's chart theme overrides
+# template fonts and st.plotly_chart sizes charts from the figure's own
+# height, so figures set chart_font and height explicitly instead.
+@st.cache_resource
+def register_chart_template():
+    pio.templates["fin"] = go.layout.Template(layout=dict(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=20, b=20)
+    ))
+    if not pio.templates.default.endswith("+fin"):
+        pio.templates.default += "+fin"
+
+register_chart_template()
+chart_font = dict(family='Inter', size=11)
+
+# -----------------------------------------------------
+# Chart Helpers
+# -----------------------------------------------------
+MAX_LINE_POINTS = 500
+
+def downsample(x, y, n_out=MAX_LINE_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling for line charts."""
+    n = len(y)
+    if n <= n_out:
+        return x, y
+
+    # Category axes (e.g. month names) are bucketed by position
+    xs = x.astype(float) if np.issubdtype(x.dtype, np.number) else np.arange(n, dtype=float)
+    ys = y.astype(float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = xs[nlo:nhi].mean(), ys[nlo:nhi].mean()
+        area = np.abs(
+            (xs[a] - avg_x) * (ys[lo:hi] - ys[a])
+            - (xs[a] - xs[lo:hi]) * (avg_y - ys[a])
+        )
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
 # -----------------------------------------------------
 # ROW 1: Sales Trend (Full Width)
 # -----------------------------------------------------
 st.markdown("### 📈 Sales Performance")
 
-product_options = sorted(filtered_df["Product"].dropna().unique())
+@st.fragment
+def sales_trend_section(sales_yp):
+    product_options = sales_yp.index.tolist()
 
-if product_options:
-    product_selected = st.selectbox(
-        "Select Product for Trend Analysis",
-        options=product_options,
-        key="insight1_product"
-    )
+    if product_options:
+        product_selected = st.selectbox(
+            "Select Product for Trend Analysis",
+            options=product_options,
+            key="insight1_product"
+        )
 
-    sales_trend_df = (
-        filtered_df[filtered_df["Product"] == product_selected]
-        .groupby("Year", as_index=False)["Sales"]
-        .sum()
-    )
+        sales_trend_df = (
+            sales_yp.loc[product_selected]
+            .dropna()
+            .rename("Sales")
+            .reset_index()
+        )
 
-    if not sales_trend_df.empty:
-        col_metrics, col_chart = st.columns([1, 3])
-        
-        with col_metrics:
-            if len(sales_trend_df) > 1:
-                sales_change = sales_trend_df["Sales"].iloc[-1] - sales_trend_df["Sales"].iloc[0]
-                pct_change = (sales_change / sales_trend_df["Sales"].iloc[0]) * 100
-                
-                st.metric("Latest Year", f"${sales_trend_df['Sales'].iloc[-1]:,.0f}")
-                st.metric("Total Change", f"${sales_change:,.0f}", f"{pct_change:+.1f}%")
-                st.metric("Average Sales", f"${sales_trend_df['Sales'].mean():,.0f}")
-        
-        with col_chart:
-            fig = px.line(
-                sales_trend_df,
-                x="Year",
-                y="Sales",
-                markers=True,
-                title=f"Yearly Sales Trend: {product_selected}"
-            )
-            fig.update_traces(line_color=color_scheme['primary'], line_width=3, marker=dict(size=10))
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(family='Inter', size=12),
-                title_font=dict(size=16, color='#1e293b'),
-                hovermode='x unified',
-                height=350
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        if not sales_trend_df.empty:
+            vals = sales_trend_df["Sales"].to_numpy()
+            first, last = vals[0], vals[-1]
+            sales_change = last - first
+            pct_change = sales_change / first * 100.0
+            latest_text = f"${last:,.0f}"
+            change_text = f"${sales_change:,.0f}"
+            pct_text = f"{pct_change:+.1f}%"
+            average_text = f"${vals.mean():,.0f}"
+
+            col_metrics, col_chart = st.columns([1, 3])
+            
+            with col_metrics:
+                # Fixed placeholders keep the metric elements at stable positions,
+                # so reruns update them in place even when a product has one year
+                latest_slot, change_slot, average_slot = st.empty(), st.empty(), st.empty()
+                if len(vals) > 1:
+                    latest_slot.metric("Latest Year", latest_text)
+                    change_slot.metric("Total Change", change_text, pct_text)
+                    average_slot.metric("Average Sales", average_text)
+            
+            with col_chart:
+                trend_x, trend_y = downsample(
+                    sales_trend_df["Year"].to_numpy(),
+                    sales_trend_df["Sales"].to_numpy()
+                )
+                fig = go.Figure(go.Scattergl(
+                    x=trend_x,
+                    y=trend_y,
+                    mode="lines+markers",
+                    hovertemplate="Year=%{x}<br>Sales=%{y}<extra></extra>",
+                    line=dict(color=color_scheme['primary'], width=3),
+                    marker=dict(size=10)
+                ))
+                fig.update_layout(
+                    title=f"Yearly Sales Trend: {product_selected}",
+                    xaxis_title="Year",
+                    yaxis_title="Sales",
+                    font=dict(family='Inter', size=12),
+                    title_font=dict(size=16, color='#1e293b'),
+                    hovermode='x unified',
+                    height=350,
+                    margin=dict(t=100, b=80)
+                )
+                st.plotly_chart(fig, use_container_width=True, key="fig_sales_trend")
+        else:
+            st.warning("⚠️ No sales data available for the selected filters.")
     else:
-        st.warning("⚠️ No sales data available for the selected filters.")
-else:
-    st.warning("⚠️ No products available for the selected filters.")
+        st.warning("⚠️ No products available for the selected filters.")
+
+sales_trend_section(aggs["sales_yp"])
 
 st.markdown("---")
 
@@ -284,17 +331,11 @@ st.markdown("---")
 # -----------------------------------------------------
 col1, col2 = st.columns(2)
 
-with col1:
+@st.fragment
+def profit_panel(profit_sc):
     st.markdown("#### 💰 Profit Optimization")
     st.caption("Top segment-country combinations")
     
-    profit_by_segment_country = (
-        filtered_df
-        .groupby(["Segment", "Country"], as_index=False)["Profit"]
-        .sum()
-        .sort_values(by="Profit", ascending=False)
-    )
-    
     top_n = st.selectbox(
         "Show top",
         options=[5, 10, 15],
@@ -302,74 +343,87 @@ with col1:
         key="insight2_topn"
     )
     
-    top_profit_df = profit_by_segment_country.head(top_n)
+    top_profit_df = profit_sc.nlargest(top_n).reset_index()
     
     if not top_profit_df.empty:
-        fig2 = px.bar(
-            top_profit_df,
-            x="Profit",
-            y="Segment",
-            color="Country",
+        # One trace coloured by country instead of a trace per country; codes
+        # follow first appearance and map onto the discrete Purples_r palette
+        # (darkest first). The country is labelled on each bar in place of a
+        # legend; labels that don't fit move outside the bar and never shrink
+        # below the uniformtext minimum
+        country_codes, _ = pd.factorize(top_profit_df["Country"])
+        palette = sequential.Purples_r
+        # Format the profit labels once here so hovering only substitutes them
+        profit_text = ("$" + top_profit_df["Profit"].map("{:,.0f}".format)).to_numpy()
+        fig2 = go.Figure(go.Bar(
+            x=top_profit_df["Profit"].to_numpy(),
+            y=top_profit_df["Segment"].to_numpy(),
             orientation="h",
-            labels={"Profit": "Total Profit ($)"},
-            color_discrete_sequence=px.colors.sequential.Purples_r
-        )
+            text=top_profit_df["Country"].to_numpy(),
+            textposition="auto",
+            customdata=profit_text,
+            hovertemplate="%{y} in %{text}: %{customdata}<extra></extra>",
+            marker_color=[palette[code % len(palette)] for code in country_codes]
+        ))
         fig2.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
-            showlegend=True,
-            height=400,
-            margin=dict(t=20, b=20)
+            barmode="relative",
+            xaxis_title="Total Profit ($)",
+            yaxis_title="Segment",
+            font=chart_font,
+            showlegend=False,
+            uniformtext=dict(minsize=10, mode="show"),
+            height=400
         )
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(fig2, use_container_width=True, key="fig_profit_segment")
         
         top_row = top_profit_df.iloc[0]
         st.info(
-            f"🎯 **{top_row['Segment']}** in **{top_row['Country']}** leads with **${top_row['Profit']:,.0f}**"
+            f"🎯 **{top_row['Segment']}** in **{top_row['Country']}** leads with **{profit_text[0]}**"
         )
     else:
         st.warning("⚠️ No profit data available.")
 
-with col2:
+with col1:
+    profit_panel(aggs["profit_sc"])
+
+@st.fragment
+def market_panel(country_product_sales):
     st.markdown("#### 🌍 Market Performance")
     st.caption("Product sales by country")
     
-    country_product_sales = (
-        filtered_df
-        .groupby(["Country", "Product"], as_index=False)["Sales"]
-        .sum()
-    )
-    
     country_selected = st.selectbox(
         "Select country",
-        options=sorted(country_product_sales["Country"].unique()),
+        options=country_product_sales.index.unique("Country").tolist(),
         key="insight3_country"
     )
     
-    country_sales_df = country_product_sales[
-        country_product_sales["Country"] == country_selected
-    ].sort_values(by="Sales", ascending=False)
+    country_sales_df = (
+        country_product_sales.get(country_selected, pd.Series(dtype=float, name="Sales"))
+        .sort_values(ascending=False)
+        .reset_index()
+    )
     
     if not country_sales_df.empty:
-        fig3 = px.bar(
-            country_sales_df,
-            x="Sales",
-            y="Product",
+        sales = country_sales_df["Sales"].to_numpy()
+        fig3 = go.Figure(go.Bar(
+            x=sales,
+            y=country_sales_df["Product"].to_numpy(),
             orientation="h",
-            labels={"Sales": "Total Sales ($)"},
-            color="Sales",
-            color_continuous_scale="Purples"
-        )
+            hovertemplate="Total Sales ($)=%{x}<br>Product=%{y}<extra></extra>",
+            marker=dict(
+                color=sales,
+                colorscale="Purples",
+                colorbar=dict(title="Total Sales ($)")
+            )
+        ))
         fig3.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
+            xaxis_title="Total Sales ($)",
+            yaxis_title="Product",
+            font=chart_font,
             showlegend=False,
-            height=400,
-            margin=dict(t=20, b=20)
+            height=400
         )
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(fig3, use_container_width=True, key="fig_country_sales")
         
         top_product = country_sales_df.iloc[0]
         st.info(
@@ -378,6 +432,9 @@ with col2:
     else:
         st.warning("⚠️ No sales data available.")
 
+with col2:
+    market_panel(aggs["sales_cp"])
+
 st.markdown("---")
 
 # -----------------------------------------------------
@@ -385,7 +442,8 @@ st.markdown("---")
 # -----------------------------------------------------
 col1, col2 = st.columns(2)
 
-with col1:
+@st.fragment
+def top_products_panel(sales_p):
     st.markdown("#### 🏆 Top Performing Products")
     st.caption("Best selling products overall")
     
@@ -396,33 +454,29 @@ with col1:
         key="insight4_topn"
     )
     
-    top_products_df = (
-        filtered_df
-        .groupby("Product", as_index=False)["Sales"]
-        .sum()
-        .sort_values(by="Sales", ascending=False)
-        .head(top_products_n)
-    )
+    top_products_df = sales_p.nlargest(top_products_n).reset_index()
     
     if not top_products_df.empty:
-        fig4 = px.bar(
-            top_products_df,
-            x="Sales",
-            y="Product",
+        sales = top_products_df["Sales"].to_numpy()
+        fig4 = go.Figure(go.Bar(
+            x=sales,
+            y=top_products_df["Product"].to_numpy(),
             orientation="h",
-            labels={"Sales": "Total Sales ($)"},
-            color="Sales",
-            color_continuous_scale="Viridis"
-        )
+            hovertemplate="Total Sales ($)=%{x}<br>Product=%{y}<extra></extra>",
+            marker=dict(
+                color=sales,
+                colorscale="Viridis",
+                colorbar=dict(title="Total Sales ($)")
+            )
+        ))
         fig4.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
+            xaxis_title="Total Sales ($)",
+            yaxis_title="Product",
+            font=chart_font,
             showlegend=False,
-            height=400,
-            margin=dict(t=20, b=20)
+            height=400
         )
-        st.plotly_chart(fig4, use_container_width=True)
+        st.plotly_chart(fig4, use_container_width=True, key="fig_top_products")
         
         top_product = top_products_df.iloc[0]
         col_a, col_b = st.columns(2)
@@ -433,15 +487,14 @@ with col1:
     else:
         st.warning("⚠️ No product data available.")
 
+with col1:
+    top_products_panel(aggs["sales_p"])
+
 with col2:
     st.markdown("#### 💸 Discount Impact")
     st.caption("Sales vs profit by discount band")
     
-    discount_analysis_df = (
-        filtered_df
-        .groupby("Discount Band", as_index=False)[["Sales", "Profit"]]
-        .mean()
-    )
+    discount_analysis_df = aggs["discount_mean"].reset_index()
     
     if not discount_analysis_df.empty:
         fig5 = go.Figure()
@@ -459,13 +512,10 @@ with col2:
         ))
         fig5.update_layout(
             barmode="group",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
-            height=400,
-            margin=dict(t=20, b=20)
+            font=chart_font,
+            height=400
         )
-        st.plotly_chart(fig5, use_container_width=True)
+        st.plotly_chart(fig5, use_container_width=True, key="fig_discount")
         
         st.info(
             "💡 Higher discounts boost sales but can erode margins."
@@ -480,39 +530,43 @@ st.markdown("---")
 # -----------------------------------------------------
 col1, col2 = st.columns(2)
 
-with col1:
+@st.fragment
+def seasonal_panel(monthly_pm):
     st.markdown("#### 📆 Seasonal Sales Patterns")
     st.caption("Monthly trends for campaign timing")
     
     product_month_selected = st.selectbox(
         "Select product",
-        options=sorted(filtered_df["Product"].unique()),
+        options=monthly_pm.index.unique("Product").tolist(),
         key="insight6_product"
     )
     
     monthly_sales_df = (
-        filtered_df[filtered_df["Product"] == product_month_selected]
-        .groupby("Month Name", as_index=False)["Sales"]
-        .sum()
+        monthly_pm.get(product_month_selected, pd.Series(dtype=float, name="Sales"))
+        .reset_index()
     )
     
     if not monthly_sales_df.empty:
-        fig6 = px.line(
-            monthly_sales_df,
-            x="Month Name",
-            y="Sales",
-            markers=True
+        month_x, month_y = downsample(
+            monthly_sales_df["Month Name"].to_numpy(),
+            monthly_sales_df["Sales"].to_numpy()
         )
-        fig6.update_traces(line_color=color_scheme['success'], line_width=3, marker=dict(size=10))
+        fig6 = go.Figure(go.Scattergl(
+            x=month_x,
+            y=month_y,
+            mode="lines+markers",
+            hovertemplate="Month Name=%{x}<br>Sales=%{y}<extra></extra>",
+            line=dict(color=color_scheme['success'], width=3),
+            marker=dict(size=10)
+        ))
         fig6.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
+            xaxis_title="Month Name",
+            yaxis_title="Sales",
+            font=chart_font,
             hovermode='x unified',
-            height=350,
-            margin=dict(t=20, b=20)
+            height=350
         )
-        st.plotly_chart(fig6, use_container_width=True)
+        st.plotly_chart(fig6, use_container_width=True, key="fig_monthly_sales")
         
         st.info(
             f"🎯 Target optimal windows for **{product_month_selected}** campaigns"
@@ -520,36 +574,44 @@ with col1:
     else:
         st.warning("⚠️ No monthly data available.")
 
+with col1:
+    seasonal_panel(aggs["monthly_pm"])
+
 with col2:
     st.markdown("#### ⚠️ Profitability Alert")
     st.caption("Sales vs profit by country")
     
-    pricing_issue_df = (
-        filtered_df
-        .groupby("Country", as_index=False)[["Sales", "Profit"]]
-        .sum()
-    )
+    pricing_issue_df = aggs["country_sp"].reset_index()
     
     if not pricing_issue_df.empty:
-        fig7 = px.scatter(
-            pricing_issue_df,
-            x="Sales",
-            y="Profit",
-            text="Country",
-            labels={"Sales": "Total Sales ($)", "Profit": "Total Profit ($)"},
-            size="Sales",
-            color="Profit",
-            color_continuous_scale="RdYlGn"
-        )
-        fig7.update_traces(textposition='top center')
+        sales = pricing_issue_df["Sales"].to_numpy()
+        profit = pricing_issue_df["Profit"].to_numpy()
+        fig7 = go.Figure(go.Scattergl(
+            x=sales,
+            y=profit,
+            mode="markers+text",
+            text=pricing_issue_df["Country"].to_numpy(),
+            textposition="top center",
+            hovertemplate=(
+                "Total Sales ($)=%{x}<br>Total Profit ($)=%{y}"
+                "<br>Country=%{text}<extra></extra>"
+            ),
+            marker=dict(
+                size=sales,
+                sizemode="area",
+                sizeref=sales.max() / 20 ** 2,
+                color=profit,
+                colorscale="RdYlGn",
+                colorbar=dict(title="Total Profit ($)")
+            )
+        ))
         fig7.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', size=11),
-            height=350,
-            margin=dict(t=20, b=20)
+            xaxis_title="Total Sales ($)",
+            yaxis_title="Total Profit ($)",
+            font=chart_font,
+            height=350
         )
-        st.plotly_chart(fig7, use_container_width=True)
+        st.plotly_chart(fig7, use_container_width=True, key="fig_pricing")
         
         st.info(
             "💡 High sales + low profit = pricing optimization opportunity"
@@ -565,43 +627,50 @@ st.markdown("---")
 st.markdown("#### 📊 Market Concentration Analysis")
 st.caption("Product diversification assessment")
 
-market_dominance_df = (
-    filtered_df
-    .groupby(["Country", "Product"], as_index=False)["Sales"]
-    .sum()
-)
-
-country_dom_selected = st.selectbox(
-    "Select Country for Market Analysis",
-    options=sorted(market_dominance_df["Country"].unique()),
-    key="insight8_country"
-)
-
-country_dom_df = market_dominance_df[
-    market_dominance_df["Country"] == country_dom_selected
-]
-
-if not country_dom_df.empty:
-    fig8 = px.treemap(
-        country_dom_df,
-        path=["Product"],
-        values="Sales",
-        title=f"Market Share Distribution: {country_dom_selected}",
-        color="Sales",
-        color_continuous_scale="Purples"
+@st.fragment
+def market_concentration_section(market_dominance_df):
+    country_dom_selected = st.selectbox(
+        "Select Country for Market Analysis",
+        options=market_dominance_df.index.unique("Country").tolist(),
+        key="insight8_country"
     )
-    fig8.update_layout(
-        font=dict(family='Inter', size=12),
-        title_font=dict(size=16, color='#1e293b'),
-        height=400
-    )
-    st.plotly_chart(fig8, use_container_width=True)
-    
-    st.info(
-        f"🎯 Monitor concentration risk in **{country_dom_selected}** and explore diversification opportunities"
+
+    country_dom_df = (
+        market_dominance_df.get(country_dom_selected, pd.Series(dtype=float, name="Sales"))
+        .reset_index()
     )
-else:
-    st.warning("⚠️ No dominance data available.")
+
+    if not country_dom_df.empty:
+        labels = country_dom_df["Product"].to_numpy()
+        values = country_dom_df["Sales"].to_numpy()
+        parents = np.full(len(labels), "", dtype=object)
+        fig8 = go.Figure(go.Treemap(
+            labels=labels,
+            parents=parents,
+            values=values,
+            marker=dict(
+                colors=values,
+                colorscale="Purples",
+                showscale=True,
+                colorbar=dict(title="Sales")
+            )
+        ))
+        fig8.update_layout(
+            title=f"Market Share Distribution: {country_dom_selected}",
+            font=dict(family='Inter', size=12),
+            title_font=dict(size=16, color='#1e293b'),
+            height=400,
+            margin=dict(t=100, b=80)
+        )
+        st.plotly_chart(fig8, use_container_width=True, key="fig_market_share")
+        
+        st.info(
+            f"🎯 Monitor concentration risk in **{country_dom_selected}** and explore diversification opportunities"
+        )
+    else:
+        st.warning("⚠️ No dominance data available.")
+
+market_concentration_section(aggs["sales_cp"])
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,10 @@
+# =====================================================
+# One-time conversion of the source workbook to Parquet
+# =====================================================
+# Run once whenever the Excel file changes:
+#     python to_parquet.py
+
+import pandas as pd
+
+df = pd.read_excel("Financial Data - DA Assesment.xlsx")
+df.to_parquet("financial.parquet", engine="pyarrow", compression="zstd")